@@ -3,6 +3,7 @@ from pathlib import Path
 import os
 import typer
 from rich import print
+from . import __version__
 from .core import Orchestrator
 
 app = typer.Typer(help="Contract Auditor CLI")
@@ -14,7 +15,8 @@ def audit(
     out: str = typer.Option("out", help="Output root folder"),
     llm: str = typer.Option("off", help="on | off (LLM augmentation)"),
     slither: str = typer.Option("auto", "--slither", help="static analysis mode: auto | host | stub"),
-    eop: str = typer.Option("auto", "--eop", help="EoP test gating: auto | stride | heuristic | both | off")
+    eop: str = typer.Option("auto", "--eop", help="EoP test gating: auto | stride | heuristic | both | off"),
+    jobs: int = typer.Option(1, "--jobs", min=1, help="max generated test projects run in parallel (each forge/cargo build already uses all cores)")
 ):
     """
     Task 2:
@@ -24,13 +26,12 @@ def audit(
     - threats.json (empty buckets)
     - report.md/html
     """
-    orchestrator = Orchestrator(input_path_or_address=input, kind=kind, out_root=Path(out), llm=(llm=="on"), static_mode=slither, eop_mode=eop)
+    orchestrator = Orchestrator(input_path_or_address=input, kind=kind, out_root=Path(out), llm=(llm=="on"), static_mode=slither, eop_mode=eop, jobs=jobs)
     outdir = orchestrator.run()
     print(f"[bold green]Audit completed[/bold green] → {outdir}")
 
 @app.command()
 def version():
-    from . import __version__
     print(__version__)
 
 if __name__ == "__main__":
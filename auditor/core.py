@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 from .utils import (
@@ -15,15 +16,19 @@ from .testgen.foundry import generate_foundry_tests
 from .runners.forge_runner import run_forge_tests
 from .testgen.soroban import generate_soroban_tests
 from .runners.cargo_runner import run_cargo_tests
+from .report.builder import build_report
 
 class Orchestrator:
-    def __init__(self, input_path_or_address: str, kind: str = "evm", out_root: Path = Path("out"), llm: bool = False, static_mode: str = "auto", eop_mode: str = "auto"):
+    def __init__(self, input_path_or_address: str, kind: str = "evm", out_root: Path = Path("out"), llm: bool = False, static_mode: str = "auto", eop_mode: str = "auto", jobs: int = 1):
         self.input = input_path_or_address
         self.kind = kind
         self.out_root = out_root
         self.llm = llm
         self.static_mode = static_mode
         self.eop_mode = eop_mode
+        # cap on concurrent forge/cargo subprocesses; each build already uses every core
+        # and has its own target dir, so projects run one at a time unless raised
+        self.jobs = max(1, jobs)
 
         ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         self.outdir = out_root / ts
@@ -72,7 +77,7 @@ class Orchestrator:
         findings = []
         if res.get("ok"):
             norm = normalize_slither(Path(res["path"]))
-            (static_dir / "slither.normalized.json").write_text(__import__("json").dumps(norm, indent=2))
+            json_dump_atomic(static_dir / "slither.normalized.json", norm)
             findings = norm
         # Map to STRIDE and stitch with empty buckets for all functions
         mapped = map_findings_to_stride(findings)
@@ -90,41 +95,42 @@ class Orchestrator:
         # persist test meta (e.g., eop_mode)
         meta_dir = self.outdir / "runs" / "tests"
         meta_dir.mkdir(parents=True, exist_ok=True)
-        (meta_dir / "meta.json").write_text(__import__("json").dumps({"eop_mode": self.eop_mode}, indent=2))
+        json_dump_atomic(meta_dir / "meta.json", {"eop_mode": self.eop_mode}, indent=None)
         return tests
 
     def _run_tests(self) -> dict:
         results = {"runs": []}
         test_root = self.outdir / "tests" / ("evm" if self.kind=="evm" else "soroban")
         runs_dir = self.outdir / "runs" / "tests"
-        if test_root.exists():
-            for proj in sorted(test_root.iterdir()):
-                if not proj.is_dir(): continue
-                out_file = runs_dir / f"{proj.name}.json"
-                if self.kind == "evm":
-                    res = run_forge_tests(proj, out_file)
-                else:
-                    res = run_cargo_tests(proj, out_file)
-                results["runs"].append(res)
+        # scandir: DirEntry.is_dir() uses the d_type from the listing, no stat per child;
+        # a missing test root (nothing generated) surfaces from the listing itself
+        try:
+            with os.scandir(test_root) as it:
+                projects = sorted(e.path for e in it if e.is_dir())
+        except FileNotFoundError:
+            projects = []
+        if projects:
+            # each project is an independent forge/cargo subprocess; up to self.jobs run at once
+            with ThreadPoolExecutor(max_workers=min(len(projects), self.jobs)) as pool:
+                results["runs"].extend(pool.map(lambda p: self._run_project(Path(p), runs_dir), projects))
         return results
 
+    def _run_project(self, proj: Path, runs_dir: Path) -> dict:
+        out_file = runs_dir / f"{proj.name}.json"
+        if self.kind == "evm":
+            return run_forge_tests(proj, out_file)
+        return run_cargo_tests(proj, out_file)
+
     def _report(self) -> None:
         # very small report that lists contracts and functions
-        from .report.builder import build_report
         build_report(self.outdir)
 
     def run(self) -> Path:
         self._prepare()
         flows = self._explore()
         journeys = self._journeys(flows)
-        self._threats(flows, journeys)
-        # load threats from file for gating
-        import json
-        threats = {}
-        tfile = self.outdir / 'threats.json'
-        if tfile.exists():
-            try: threats = json.loads(tfile.read_text())
-            except Exception: threats = {}
+        # _threats validates and writes threats.json, and returns the same dict
+        threats = self._threats(flows, journeys)
         self._generate_tests(flows, journeys, threats)
         self._run_tests()
         self._report()
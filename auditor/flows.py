@@ -1,7 +1,8 @@
 from __future__ import annotations
 import re, json
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from .utils import iter_source_files
 
 CONTRACT_RE = re.compile(r"\bcontract\s+(\w+)", re.MULTILINE)
 EVENT_RE    = re.compile(r"\bevent\s+(\w+)\s*\(([^)]*)\)\s*;", re.MULTILINE)
@@ -25,84 +26,45 @@ def _parse_params(argstr: str) -> List[Dict[str, str]]:
         args.append({"name": _name.strip().lstrip("_"), "type": _type.strip()})
     return args
 
-def extract_flows_from_dir(src_dir: Path, kind: str = "evm") -> Dict[str, Any]:
-    contracts = []
-    for f in src_dir.rglob("*.sol"):
-        text = f.read_text(errors="ignore")
-        # For each contract in this file
-        for m in CONTRACT_RE.finditer(text):
-            cname = m.group(1)
-            body = text  # naive: scan file-level for funcs/events
-            events = []
-            for em in EVENT_RE.finditer(body):
-                ename, eargs = em.group(1), em.group(2)
-                events.append({"name": ename, "params": [a.strip() for a in eargs.split(",") if a.strip()]})
-
-            functions = []
-            for fm in FUNC_RE.finditer(body):
-                name = fm.group("name")
-                inputs = _parse_params(fm.group("args") or "")
-                vis = fm.group("visibility") or None
-                mut = fm.group("mutability") or None
-                # crude heuristic to guess outputs: look for "returns (...)" next to the signature
-                # not perfect, but good enough for Task 2
-                # (skip for now; leave empty)
-                outputs = []
-                functions.append({
-                    "name": name,
-                    "visibility": vis,
-                    "mutability": mut,
-                    "inputs": inputs,
-                    "outputs": outputs,
-                    "modifiers": [],
-                    "events_emitted": []
-                })
-
-            contracts.append({
-                "name": cname,
-                "visibility": "public",
-                "inherits": [],
-                "state_vars": [],
-                "functions": functions,
-                "events": events
-            })
-    return {"contracts": contracts}
-
 def _extract_evm_flows(root: Path) -> dict:
     contracts = []
-    for f in root.rglob("*.sol"):
+    for f in iter_source_files(root, ".sol"):
         text = f.read_text(errors="ignore")
-        # For each contract in this file
-        for m in CONTRACT_RE.finditer(text):
-            cname = m.group(1)
-            body = text  # naive: scan file-level for funcs/events
-            events = []
-            for em in EVENT_RE.finditer(body):
-                ename, eargs = em.group(1), em.group(2)
-                events.append({"name": ename, "params": [a.strip() for a in eargs.split(",") if a.strip()]})
+        rel = f.relative_to(root).as_posix()
+        names = [m.group(1) for m in CONTRACT_RE.finditer(text)]
+        if not names:
+            continue
+        # naive: funcs/events are scanned at file level, so every contract in
+        # the file shares them
+        events = []
+        for em in EVENT_RE.finditer(text):
+            ename, eargs = em.group(1), em.group(2)
+            events.append({"name": ename, "params": [a.strip() for a in eargs.split(",") if a.strip()]})
 
-            functions = []
-            for fm in FUNC_RE.finditer(body):
-                name = fm.group("name")
-                inputs = _parse_params(fm.group("args") or "")
-                vis = fm.group("visibility") or None
-                mut = fm.group("mutability") or None
-                # crude heuristic to guess outputs: look for "returns (...)" next to the signature
-                # not perfect, but good enough for Task 2
-                # (skip for now; leave empty)
-                outputs = []
-                functions.append({
-                    "name": name,
-                    "visibility": vis,
-                    "mutability": mut,
-                    "inputs": inputs,
-                    "outputs": outputs,
-                    "modifiers": [],
-                    "events_emitted": []
-                })
+        functions = []
+        for fm in FUNC_RE.finditer(text):
+            name = fm.group("name")
+            inputs = _parse_params(fm.group("args") or "")
+            vis = fm.group("visibility") or None
+            mut = fm.group("mutability") or None
+            # crude heuristic to guess outputs: look for "returns (...)" next to the signature
+            # not perfect, but good enough for Task 2
+            # (skip for now; leave empty)
+            outputs = []
+            functions.append({
+                "name": name,
+                "visibility": vis,
+                "mutability": mut,
+                "inputs": inputs,
+                "outputs": outputs,
+                "modifiers": [],
+                "events_emitted": []
+            })
 
+        for cname in names:
             contracts.append({
                 "name": cname,
+                "file": rel,  # defining file, relative to the source root
                 "visibility": "public",
                 "inherits": [],
                 "state_vars": [],
@@ -111,17 +73,23 @@ def _extract_evm_flows(root: Path) -> dict:
             })
     return {"contracts": contracts}
 
-def _extract_rust_flows(root: Path) -> dict:
+def _read_rust_sources(root: Path) -> List[Tuple[Path, str]]:
+    sources = []
+    for f in iter_source_files(root, ".rs"):
+        try:
+            sources.append((f, f.read_text(errors="ignore")))
+        except Exception:
+            continue
+    return sources
+
+def _extract_rust_flows(root: Path, sources: Optional[List[Tuple[Path, str]]] = None) -> dict:
     # Very lightweight parser:
     # - treat each 'mod <name> {' as a contract/module
     # - collect 'pub fn <name>(args...)' signatures
     contracts = []
-    rs_files = list(root.rglob("*.rs"))
-    for f in rs_files:
-        try:
-            txt = f.read_text(errors="ignore")
-        except Exception:
-            continue
+    if sources is None:
+        sources = _read_rust_sources(root)
+    for f, txt in sources:
         # modules as "contracts"
         modules = re.findall(r"\bmod\s+([A-Za-z0-9_]+)\s*\{", txt)
         if not modules:
@@ -160,11 +128,9 @@ def _extract_soroban_flows(root: Path) -> dict:
     # - #[contract] pub struct Name;
     # - #[contractimpl] impl Name { pub fn foo(env: Env, ...) ... }
     contracts = []
-    for f in root.rglob("*.rs"):
-        try:
-            txt = f.read_text(errors="ignore")
-        except Exception:
-            continue
+    # read the tree once; the generic-rust fallback below reuses it
+    sources = _read_rust_sources(root)
+    for f, txt in sources:
         # find contract structs
         for m in re.finditer(r"#\[contract\]\s*pub\s+struct\s+([A-Za-z0-9_]+)", txt):
             cname = m.group(1)
@@ -190,10 +156,9 @@ def _extract_soroban_flows(root: Path) -> dict:
                 contracts.append({"name": cname, "events": [], "functions": functions})
     # fallback to generic rust if none found
     if not contracts:
-        return _extract_rust_flows(root)
+        return _extract_rust_flows(root, sources)
     return {"contracts": contracts}
 
-# Update the main function to route based on kind
 def extract_flows_from_dir(src_dir: Path, kind: str = "evm") -> Dict[str, Any]:
     if kind == "evm":
         return _extract_evm_flows(src_dir)
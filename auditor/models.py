@@ -12,6 +12,7 @@ class FlowFunction(BaseModel):
 
 class FlowContract(BaseModel):
     name: str
+    file: Optional[str] = None
     visibility: Optional[str] = None
     inherits: List[str] = []
     state_vars: List[Dict] = []
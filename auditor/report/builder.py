@@ -1,86 +1,78 @@
 from __future__ import annotations
 from pathlib import Path
-import json
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import os
+from functools import lru_cache
+from operator import itemgetter
+import heapq
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from ..utils import json_dump_atomic, json_loads, read_json
+from ..stride import is_sensitive_fn
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+@lru_cache(maxsize=1)
+def _template_env() -> Environment:
+    # one shared Environment keeps compiled templates cached across reports; the
+    # templates ship with the package, so auto_reload is off. The bytecode cache
+    # (per-user temp dir, keyed by source checksum) carries them across CLI runs.
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=select_autoescape(),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+    return env
 
 def build_report(outdir: Path) -> None:
-    flows = json.loads((outdir / "flows.json").read_text())
+    flows = json_loads((outdir / "flows.json").read_bytes())
     
     # Load test results if they exist
     test_runs = []
     test_dir = outdir / "runs" / "tests"
-    if test_dir.exists():
-        for f in test_dir.glob("*.json"):
-            try:
-                test_runs.append(json.loads(f.read_text()))
-            except Exception:
-                pass
+    # scandir + suffix check: no pattern matching or Path building per entry
+    try:
+        with os.scandir(test_dir) as it:
+            paths = [e.path for e in it if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()]
+    except FileNotFoundError:
+        paths = []
+    for p in paths:
+        data = read_json(Path(p))
+        if data is not None:
+            test_runs.append(data)
     
-    env = Environment(
-        loader=FileSystemLoader(str(Path("auditor/report/templates"))),
-        autoescape=select_autoescape()
+    env = _template_env()
+    # Compute gas top data: the 10 highest (journey, test) rows, picked from a generator
+    gas_rows = (
+        {"journey": r.get("project"), "test": tname, "gas": int(g)}
+        for r in test_runs for tname, g in (r.get("gas") or {}).items()
     )
-    def load_json(path):
-        try:
-            return json.loads(Path(path).read_text())
-        except Exception:
-            return [] if path.endswith('.json') else {}
-    
-    # Compute gas top data
-    gas_rows = []
-    for r in test_runs:
-        for tname, g in (r.get("gas") or {}).items():
-            gas_rows.append({"journey": r.get("project"), "test": tname, "gas": int(g)})
-    gas_top = sorted(gas_rows, key=lambda x: x["gas"], reverse=True)[:10]
+    gas_top = heapq.nlargest(10, gas_rows, key=itemgetter("gas"))
 
     # ----- EoP Coverage computation -----
     # load modes/meta
-    eop_mode = 'auto'
-    tests_meta = outdir / 'runs' / 'tests' / 'meta.json'
-    if tests_meta.exists():
-        try:
-            eop_mode = (json.loads(tests_meta.read_text()) or {}).get('eop_mode','auto')
-        except Exception:
-            pass
+    meta = read_json(outdir / 'runs' / 'tests' / 'meta.json', {})
+    eop_mode = meta.get('eop_mode', 'auto') if isinstance(meta, dict) else 'auto'
 
     # load threats for stride
-    threats = {}
-    tfile = outdir / 'threats.json'
-    if tfile.exists():
-        try:
-            threats = json.loads(tfile.read_text())
-        except Exception:
-            threats = {}
+    threats = read_json(outdir / 'threats.json', {})
 
-    # heuristic prefixes (mirror of generator)
-    SENSITIVE_PREFIXES = [
-        'withdraw','sweep','rescue','mint','burn','pause','unpause',
-        'upgrade','authorize','deauthorize','grantrole','revokerole',
-        'setowner','transferownership','setadmin','setguardian','emergency',
-        'setfee','settreasury','setwhitelist','addwhitelist','removewhitelist'
-    ]
-    def _is_sensitive_fn(fn: str) -> bool:
-        fl = (fn or '').lower()
-        return any(fl == p or fl.startswith(p) for p in SENSITIVE_PREFIXES)
+    # normalized eop mode and the STRIDE-flagged EoP functions ("Contract.fn")
+    m = (eop_mode or 'auto').lower()
+    by_function = (threats.get('by_function') or {}) if isinstance(threats, dict) else {}
+    stride_eop = {k for k, b in by_function.items() if (b or {}).get('elevation_of_privilege')}
 
     # build candidate set (depends on eop_mode)
     candidates = []  # rows: {contract,function,gating}
-    for c in (flows.get('contracts') or []):
+    # 'off' gates nothing, so the function walk is skipped
+    for c in ((flows.get('contracts') or []) if m != 'off' else []):
         cname = c.get('name')
         for f in (c.get('functions') or []):
             fname = f.get('name')
-            key = f"{cname}.{fname}"
-            has_stride = False
-            if isinstance(threats, dict):
-                b = (threats.get('by_function') or {}).get(key, {})
-                has_stride = len((b or {}).get('elevation_of_privilege') or []) > 0
-            has_heur = _is_sensitive_fn(fname)
-            m = (eop_mode or 'auto').lower()
+            has_stride = f"{cname}.{fname}" in stride_eop
+            has_heur = is_sensitive_fn(fname)
             gated = False
             src = 'none'
-            if m == 'off':
-                gated = False
-            elif m == 'stride':
+            if m == 'stride':
                 gated = has_stride; src = 'stride'
             elif m == 'heuristic':
                 gated = has_heur; src = 'heuristic'
@@ -94,34 +86,31 @@ def build_report(outdir: Path) -> None:
 
     # map test runs -> presence/status of eop tests
     # project name convention from generator: e.g., happy_Contract_function
+    runs_by_project = {}
+    for r in (test_runs if candidates else []):
+        runs_by_project.setdefault(r.get('project'), r)
     eop_rows = []
     for row in candidates:
         proj = f"happy_{row['contract']}_{row['function']}"
-        tr = next((r for r in test_runs if r.get('project') == proj), None)
+        tr = runs_by_project.get(proj)
         tested = False; status = None
         if tr:
-            names = [t.get('name','') for t in (tr.get('tests') or [])]
-            # exact eop test name pattern:
+            # exact eop test name pattern; one pass finds both presence and status
             target = f"test_eop_block_{row['function']}"
-            matched = [n for n in names if n == target]
-            if matched:
+            stat = next((t for t in tr.get('tests') or [] if t.get('name') == target), None)
+            if stat is not None:
                 tested = True
-                stat = next((t for t in tr.get('tests') or [] if t.get('name')==target), {})
                 status = stat.get('status')
         eop_rows.append({**row, 'project': proj, 'tested': tested, 'status': status})
 
     # Load static analysis metadata
-    static_meta = {}
-    sm = outdir / 'runs' / 'static' / 'metadata.json'
-    if sm.exists():
-        try: 
-            static_meta = json.loads(sm.read_text())
-        except Exception: 
-            static_meta = {}
+    static_meta = read_json(outdir / 'runs' / 'static' / 'metadata.json', {})
+    # normalized Slither findings, passed to the HTML template as data
+    findings = read_json(outdir / 'runs' / 'static' / 'slither.normalized.json', [])
 
-    md = env.get_template("report.md.j2").render(flows=flows, outdir=str(outdir), load_json=load_json, test_runs=test_runs, gas_top=gas_top, static_meta=static_meta, eop_rows=eop_rows, eop_mode=eop_mode)
-    html = env.get_template("report.html.j2").render(flows=flows, outdir=str(outdir), load_json=load_json, test_runs=test_runs, gas_top=gas_top, static_meta=static_meta, eop_rows=eop_rows, eop_mode=eop_mode)
+    md = env.get_template("report.md.j2").render(flows=flows, outdir=str(outdir), test_runs=test_runs, gas_top=gas_top, static_meta=static_meta, eop_rows=eop_rows, eop_mode=eop_mode)
+    html = env.get_template("report.html.j2").render(flows=flows, outdir=str(outdir), threats=threats, findings=findings, test_runs=test_runs, gas_top=gas_top, static_meta=static_meta, eop_rows=eop_rows, eop_mode=eop_mode)
     (outdir / "report.md").write_text(md)
     (outdir / "report.html").write_text(html)
     # also write report.json placeholder
-    (outdir / "report.json").write_text(json.dumps({"summary":"Task 6 with real Slither integration"}, indent=2))
+    json_dump_atomic(outdir / "report.json", {"summary":"Task 6 with real Slither integration"})
@@ -1,7 +1,8 @@
 from __future__ import annotations
-import subprocess, json
+import subprocess
 from pathlib import Path
 from typing import Dict, Any
+from ..utils import json_dump_atomic
 
 def run_cargo_tests(project_dir: Path, out_json: Path) -> Dict[str, Any]:
     try:
@@ -21,6 +22,5 @@ def run_cargo_tests(project_dir: Path, out_json: Path) -> Dict[str, Any]:
         }
     except Exception as e:
         res = {"project": project_dir.name, "passed": 0, "failed": 0, "exit_code": -1, "error": str(e)}
-    out_json.parent.mkdir(parents=True, exist_ok=True)
-    out_json.write_text(json.dumps(res, indent=2))
+    json_dump_atomic(out_json, res, indent=None)
     return res
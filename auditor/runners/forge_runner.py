@@ -1,12 +1,13 @@
 from __future__ import annotations
-import subprocess, json, re
+import subprocess, re
 from pathlib import Path
 from typing import Dict, Any
+from ..utils import json_dump_atomic
 
 SUMMARY_RE = re.compile(r"(\d+)\s+passed;\s+(\d+)\s+failed", re.I)
 PASS_RE = re.compile(r"\[PASS\]\s+(test\w+)\b")
 FAIL_RE = re.compile(r"\[FAIL\]\s+(test\w+)\b")
-SNAP_RE = re.compile(r"^\s*([A-Za-z0-9_]+)\(\)\s*\(gas:\s*(\d+)\)\s*$")
+GAS_RE = re.compile(r"\[PASS\]\s+(test\w+)\([^)]*\)\s*\(gas:\s*(\d+)\)")
 
 def _run(cmd, cwd: Path) -> str:
     p = subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True, timeout=900)
@@ -24,15 +25,8 @@ def run_forge_tests(project_dir: Path, out_json: Path) -> Dict[str, Any]:
             tests.append({"name": name, "status": "passed"})
         for name in FAIL_RE.findall(out):
             tests.append({"name": name, "status": "failed"})
-        # Gas snapshot (best-effort)
-        _run(["forge", "snapshot"], project_dir)
-        gas = {}
-        snap = project_dir / ".gas-snapshot"
-        if snap.exists():
-            for line in snap.read_text().splitlines():
-                m = SNAP_RE.match(line.strip())
-                if m:
-                    gas[m.group(1)] = int(m.group(2))
+        # Gas (best-effort): the "(gas: N)" that `forge test` prints per passing test
+        gas = {name: int(g) for name, g in GAS_RE.findall(out)}
         res = {
             "project": project_dir.name,
             "passed": passed,
@@ -43,6 +37,5 @@ def run_forge_tests(project_dir: Path, out_json: Path) -> Dict[str, Any]:
         }
     except Exception as e:
         res = {"project": project_dir.name, "passed": 0, "failed": 0, "exit_code": -1, "error": str(e), "tests": [], "gas": {}}
-    out_json.parent.mkdir(parents=True, exist_ok=True)
-    out_json.write_text(json.dumps(res, indent=2))
+    json_dump_atomic(out_json, res, indent=None)
     return res
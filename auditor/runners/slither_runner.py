@@ -1,14 +1,15 @@
 from __future__ import annotations
-import os, json, shutil, subprocess
+import os, shutil, subprocess
 from pathlib import Path
 from typing import Dict, Any
+from ..utils import json_dump_atomic
 
 SLITHER_IMAGE = "trailofbits/slither:latest"
 
 def _write_stub(out_dir: Path, note: str) -> Dict[str, Any]:
     out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "slither.json").write_text(json.dumps({"results":{"detectors":[]}, "note": note}, indent=2))
-    (out_dir / "metadata.json").write_text(json.dumps({"mode":"stub","ok":True,"note":note}, indent=2))
+    json_dump_atomic(out_dir / "slither.json", {"results":{"detectors":[]}, "note": note})
+    json_dump_atomic(out_dir / "metadata.json", {"mode":"stub","ok":True,"note":note}, indent=None)
     return {"ok": True, "mode": "stub", "path": str(out_dir / "slither.json")}
 
 def _host_docker_available() -> bool:
@@ -47,14 +48,14 @@ def run_slither(src_dir: Path, out_dir: Path, mode: str = "auto") -> Dict[str, A
                     "returncode": proc.returncode,
                     "stderr_tail": (proc.stderr or "")[-1200:],
                 }
-                (out_dir / "metadata.json").write_text(json.dumps(meta, indent=2))
+                json_dump_atomic(out_dir / "metadata.json", meta, indent=None)
                 if ok:
                     return {"ok": True, "mode":"host", "path": str(out_dir / "slither.json")}
                 else:
                     # Even on failure, create a minimal error json to keep pipeline flowing
-                    (out_dir / "slither.error.json").write_text(json.dumps({
+                    json_dump_atomic(out_dir / "slither.error.json", {
                         "error":"slither_failed","returncode":proc.returncode,"stderr":proc.stderr
-                    }, indent=2))
+                    })
                     # fall back to stub so downstream steps have shape
                     return _write_stub(out_dir, "Host Slither failed; fell back to stub")
             except Exception as e:
@@ -62,9 +63,9 @@ def run_slither(src_dir: Path, out_dir: Path, mode: str = "auto") -> Dict[str, A
                 return _write_stub(out_dir, f"Host Slither exception: {e}")
         elif mode == "host":
             # explicit host requested but not available
-            (out_dir / "slither.error.json").write_text(json.dumps({
+            json_dump_atomic(out_dir / "slither.error.json", {
                 "error":"host_docker_unavailable"
-            }, indent=2))
+            })
             return _write_stub(out_dir, "Host docker unavailable; used stub")
 
     # default fallback
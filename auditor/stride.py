@@ -1,14 +1,14 @@
 from __future__ import annotations
-import json, re
+import re
 from pathlib import Path
 from typing import Dict, Any, List, DefaultDict
 from collections import defaultdict
+from .utils import read_json
 
 # --- Normalize Slither JSON to a uniform list of findings ---
 def normalize_slither(slither_json_path: Path) -> List[Dict[str, Any]]:
-    try:
-        raw = json.loads(slither_json_path.read_text())
-    except Exception:
+    raw = read_json(slither_json_path)
+    if raw is None:
         return []
     detectors = raw.get("results", {}).get("detectors") or raw.get("detectors") or []
     findings = []
@@ -93,6 +93,20 @@ def map_findings_to_stride(findings: List[Dict[str, Any]]) -> Dict[str, Dict[str
         out[key][cat].append(msg)
     return out
 
+# --- Name heuristic for privileged (EoP-sensitive) functions ---
+SENSITIVE_PREFIXES = [
+    'withdraw','sweep','rescue','mint','burn','pause','unpause',
+    'upgrade','authorize','deauthorize','grantRole','revokeRole',
+    'setOwner','transferOwnership','setAdmin','setGuardian','emergency',
+    'setFee','setTreasury','setWhitelist','addWhitelist','removeWhitelist'
+]
+
+# lowercased once; str.startswith(tuple) does the whole prefix scan in C
+_SENSITIVE_PREFIXES_LOWER = tuple(p.lower() for p in SENSITIVE_PREFIXES)
+
+def is_sensitive_fn(fn: str) -> bool:
+    return (fn or '').lower().startswith(_SENSITIVE_PREFIXES_LOWER)
+
 # --- Expand journeys deterministically ---
 ADMINY = re.compile(r"^(set|grant|revoke|pause|unpause|mint|burn|upgrade|owner|admin)", re.I)
 HEAVY_NAMES = re.compile(r"(transfer|mint|burn|loop|bulk|batch|distribute)", re.I)
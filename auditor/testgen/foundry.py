@@ -1,18 +1,10 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import shutil, re, json
-
-SENSITIVE_PREFIXES = [
-    'withdraw','sweep','rescue','mint','burn','pause','unpause',
-    'upgrade','authorize','deauthorize','grantRole','revokeRole',
-    'setOwner','transferOwnership','setAdmin','setGuardian','emergency',
-    'setFee','setTreasury','setWhitelist','addWhitelist','removeWhitelist'
-]
-
-def _is_sensitive_fn(fn: str) -> bool:
-    fl = (fn or '').lower()
-    return any(fl == p.lower() or fl.startswith(p.lower()) for p in SENSITIVE_PREFIXES)
+from typing import Dict, Any, List
+import shutil, re
+from ..flows import CONTRACT_RE
+from ..stride import is_sensitive_fn
+from ..utils import iter_source_files, json_dump_atomic, link_or_copy
 
 def _default_arg(sol_type: str) -> str:
     t = (sol_type or "").strip()
@@ -63,19 +55,21 @@ def _types_and_args_for_fn(contract_meta: Dict[str,Any], fn_name: str):
             neg_args.append(_neg_arg(t))
     return typs, pos_args, neg_args
 
-def _find_contract_file(src_dir: Path, contract_name: str) -> Optional[Path]:
-    pat = re.compile(rf"\bcontract\s+{re.escape(contract_name)}\b")
-    for f in src_dir.rglob("*.sol"):
+def _index_contract_files(src_dir: Path) -> Dict[str, Path]:
+    # contract name -> first defining file (relative to src_dir)
+    index: Dict[str, Path] = {}
+    for f in iter_source_files(src_dir, ".sol"):
         try:
-            if pat.search(f.read_text(errors="ignore")):
-                return f
+            text = f.read_text(errors="ignore")
         except Exception:
-            pass
-    return None
+            continue
+        for m in CONTRACT_RE.finditer(text):
+            index.setdefault(m.group(1), f.relative_to(src_dir))
+    return index
 
 def _eop_gate(contract_name: str, fn_name: str, threats: dict | None, eop_mode: str) -> tuple[bool,str]:
     fl = (fn_name or '')
-    has_heur = _is_sensitive_fn(fl)
+    has_heur = is_sensitive_fn(fl)
     has_stride = False
     if threats:
         key = f"{contract_name}.{fn_name}"
@@ -101,6 +95,8 @@ def _test_contract_name(journey_id: str) -> str:
     base = re.sub(r"[^a-zA-Z0-9]+", " ", journey_id).title().replace(" ", "")
     return f"Test{base}"
 
+FOUNDRY_TOML = "[profile.default]\nsrc = 'src'\ntest = 'test'\n"
+
 ATTACKER_SNIPPET = '''
 // helper that invokes target via low-level call and returns success flag
 contract Attacker {
@@ -113,21 +109,19 @@ contract Attacker {
 }
 ''';
 
-def _make_test_code(contract_file_rel: str, contract_name: str, steps: List[Dict[str, Any]], flows: Dict[str,Any], threats: dict | None, eop_mode: str) -> str:
-    # collect unique function names used in the journey
-    uniq_fns = []
-    for st in steps:
-        fn = st["function"]
-        if fn not in uniq_fns:
-            uniq_fns.append(fn)
+def _make_test_code(contract_file_rel: str, contract_name: str, steps: List[Dict[str, Any]], contract_meta: Dict[str,Any], threats: dict | None, eop_mode: str) -> str:
+    # collect unique function names used in the journey (insertion-ordered)
+    uniq_fns = list(dict.fromkeys(st["function"] for st in steps))
+    # resolve each function's signature once; the happy, negative, stress and
+    # EoP blocks all reuse it
+    fn_args = {fn: _types_and_args_for_fn(contract_meta, fn) for fn in uniq_fns}
 
     # primary happy body (high-level calls)
     happy_calls = []
     for st in steps:
         fn = st["function"]
         # inputs for happy path
-        contract_meta = next((c for c in flows.get("contracts", []) if c["name"] == contract_name), None) or {}
-        _, pos_args, _ = _types_and_args_for_fn(contract_meta, fn)
+        _, pos_args, _ = fn_args[fn]
         arglist = ", ".join(pos_args) if pos_args else ""
         happy_calls.append(f"        s.{fn}({arglist});")
     happy_body = "\n".join(happy_calls) if happy_calls else "        // no-op"
@@ -135,9 +129,8 @@ def _make_test_code(contract_file_rel: str, contract_name: str, steps: List[Dict
     # negative & stress per unique function
     neg_tests = []
     stress_tests = []
-    contract_meta = next((c for c in flows.get("contracts", []) if c["name"] == contract_name), None) or {}
     for fn in uniq_fns:
-        types, pos_args, neg_args = _types_and_args_for_fn(contract_meta, fn)
+        types, pos_args, neg_args = fn_args[fn]
         # signature string for low-level call
         sig = f'{fn}({",".join(types)})'
         neg_arglist = ", ".join(neg_args) if neg_args else ""
@@ -165,18 +158,11 @@ def _make_test_code(contract_file_rel: str, contract_name: str, steps: List[Dict
 
     # build EoP tests for sensitive functions
     eop_tests = []
-    contract_meta = next((c for c in flows.get('contracts', []) if c['name'] == contract_name), None) or {}
     for fn in uniq_fns:
         ok, _src = _eop_gate(contract_name, fn, threats, eop_mode)
         if not ok:
             continue
-        types = []
-        pos_args = []
-        for cfn in contract_meta.get('functions', []):
-            if cfn['name'] == fn:
-                types = [i.get('type','') for i in cfn.get('inputs', [])]
-                pos_args = [ _default_arg(i.get('type','')) for i in cfn.get('inputs', []) ]
-                break
+        types, pos_args, _ = fn_args[fn]
         sig = f"{fn}({','.join(types)})"
         arglist = (', ' + ', '.join(pos_args)) if pos_args else ''
         eop_tests.append(f"""
@@ -208,6 +194,18 @@ contract GENERATED_{contract_name}_{uniq_fns[0]} {{
 def generate_foundry_tests(flows: Dict[str,Any], journeys: Dict[str,Any], work_src: Path, outdir: Path, threats: dict | None = None, eop_mode: str = 'auto') -> Dict[str,Any]:
     tests_idx = {"tests": []}
     root_tests = outdir / "tests" / "evm"
+    has_src = work_src.exists()
+    # defining files come from flows; sources are scanned only for flows
+    # produced without the "file" field
+    contract_files: Dict[str, Path] = {}
+    # name -> contract metadata; first definition wins
+    contracts_by_name: Dict[str, Dict[str,Any]] = {}
+    for c in flows.get("contracts", []):
+        contracts_by_name.setdefault(c["name"], c)
+        if c.get("file"):
+            contract_files.setdefault(c["name"], Path(c["file"]))
+    if not contract_files and has_src:
+        contract_files = _index_contract_files(work_src)
     for j in journeys.get("journeys", []):
         jid = j["id"]
         steps = j.get("steps", [])
@@ -220,20 +218,20 @@ def generate_foundry_tests(flows: Dict[str,Any], journeys: Dict[str,Any], work_s
         src.mkdir(parents=True, exist_ok=True)
         test.mkdir(parents=True, exist_ok=True)
         # copy all sources from work/src into project src
-        if work_src.exists():
-            shutil.copytree(work_src, src, dirs_exist_ok=True)
+        if has_src:
+            shutil.copytree(work_src, src, copy_function=link_or_copy, dirs_exist_ok=True)
         # find defining file for import path
-        cfile = _find_contract_file(src, c_name)
+        cfile = contract_files.get(c_name)
         if not cfile:
             (proj / "SKIPPED.txt").write_text(f"Contract file for {c_name} not found.")
             continue
-        rel = Path("..") / "src" / cfile.relative_to(src)
-        code = _make_test_code(str(rel).replace("\\", "/"), c_name, steps, flows, threats, eop_mode)
+        rel = Path("..") / "src" / cfile
+        code = _make_test_code(str(rel).replace("\\", "/"), c_name, steps, contracts_by_name.get(c_name, {}), threats, eop_mode)
         tname = _test_contract_name(jid)
         tfile = test / f"{tname}.t.sol"
         tfile.write_text(code)
         # minimal foundry.toml
-        (proj / "foundry.toml").write_text("[profile.default]\nsrc = 'src'\ntest = 'test'\n")
+        (proj / "foundry.toml").write_text(FOUNDRY_TOML)
         tests_idx["tests"].append({
             "id": f"{jid}_generated",
             "journey_id": jid,
@@ -241,5 +239,5 @@ def generate_foundry_tests(flows: Dict[str,Any], journeys: Dict[str,Any], work_s
             "tool": "foundry",
             "files": [str(tfile)]
         })
-    (outdir / "tests.json").write_text(json.dumps(tests_idx, indent=2))
+    json_dump_atomic(outdir / "tests.json", tests_idx)
     return tests_idx
@@ -1,7 +1,25 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
-import shutil, json, re
+import re
+from ..utils import iter_source_files, json_dump_atomic, link_or_copy
+
+# Soroban-aware manifest with dev-deps; only the crate name varies per journey
+CARGO_TOML_TEMPLATE = """[package]
+name = "soro_{crate}"
+version = "0.1.0"
+edition = "2021"
+
+[lib]
+name = "lib_{crate}"
+path = "src/lib.rs"
+
+[dependencies]
+soroban-sdk = {{ version = "21.0.0", features = ["alloc"] }}
+
+[dev-dependencies]
+soroban-sdk = {{ version = "21.0.0", features = ["testutils"] }}
+"""
 
 def _default_rust_arg(ty: str) -> str:
     t = (ty or "").replace("&", "").strip()
@@ -39,40 +57,36 @@ def _find_soroban_contract(flows: Dict[str,Any], steps: List[Dict[str,Any]]) ->
         return (contract, f"{contract}Client")
     return None
 
+def _index_input_types(flows: Dict[str,Any]) -> Dict[Tuple[str,str], List[str]]:
+    # (contract, function) -> input types; first definition wins
+    index: Dict[Tuple[str,str], List[str]] = {}
+    for c in flows.get("contracts", []):
+        for f in c.get("functions", []):
+            index.setdefault((c["name"], f["name"]), [i.get("type","") for i in f.get("inputs",[])])
+    return index
+
 def generate_soroban_tests(flows: Dict[str,Any], journeys: Dict[str,Any], work_src: Path, outdir: Path) -> Dict[str,Any]:
     root = outdir / "tests" / "soroban"
     idx = {"tests": []}
+    # source listing is the same for every journey: walk work_src once
+    rs_files = [(f, f.relative_to(work_src)) for f in iter_source_files(work_src, ".rs")] if work_src.exists() else []
+    input_types = _index_input_types(flows)
     for j in journeys.get("journeys", []):
         jid = j["id"]; steps = j.get("steps", [])
         if not steps: continue
         module = steps[0]["contract"]
+        crate = jid.replace('-', '_')
         proj = root / jid
         (proj / "src").mkdir(parents=True, exist_ok=True)
         (proj / "tests").mkdir(parents=True, exist_ok=True)
         # copy sources
-        if work_src.exists():
-            for f in work_src.rglob("*.rs"):
-                rel = f.relative_to(work_src)
-                dst = proj / "src" / rel
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copyfile(f, dst)
+        for f, rel in rs_files:
+            dst = proj / "src" / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            link_or_copy(f, dst)
 
         # Soroban-aware manifest with dev-deps
-        (proj / "Cargo.toml").write_text(f"""[package]
-name = "soro_{jid.replace('-', '_')}"
-version = "0.1.0"
-edition = "2021"
-
-[lib]
-name = "lib_{jid.replace('-', '_')}"
-path = "src/lib.rs"
-
-[dependencies]
-soroban-sdk = {{ version = "21.0.0", features = ["alloc"] }}
-
-[dev-dependencies]
-soroban-sdk = {{ version = "21.0.0", features = ["testutils"] }}
-""")
+        (proj / "Cargo.toml").write_text(CARGO_TOML_TEMPLATE.format(crate=crate))
 
         # Determine Soroban vs fallback
         soroban_pair = _find_soroban_contract(flows, steps)
@@ -83,13 +97,7 @@ soroban-sdk = {{ version = "21.0.0", features = ["testutils"] }}
             for st in steps:
                 fn = st["function"]
                 # types for args (excluding Env)
-                types = []
-                for c in flows.get("contracts", []):
-                    if c["name"] == module:
-                        meta = next((f for f in c.get("functions", []) if f["name"] == fn), None)
-                        if meta:
-                            types = [i.get("type","") for i in meta.get("inputs",[])]
-                            break
+                types = input_types.get((module, fn), [])
                 # build args using e-bound defaults (Env available as `e`)
                 # NOTE: we don't pass Env when using client
                 filtered = [t for t in types if t not in ("Env","soroban_sdk::Env")]
@@ -98,7 +106,7 @@ soroban-sdk = {{ version = "21.0.0", features = ["testutils"] }}
             body = "\n".join(calls) if calls else "    // no-op"
             (proj / "tests" / "generated.rs").write_text(f"""use soroban_sdk::{{testutils::*, Env, Address, Symbol, Bytes}};
 use soroban_sdk::testutils::Address as TestAddress;
-use lib_{jid.replace('-', '_')}::*;
+use lib_{crate}::*;
 
 #[test]
 fn journey_with_env_and_client() {{
@@ -113,13 +121,7 @@ fn journey_with_env_and_client() {{
             calls = []
             for st in steps:
                 fn = st["function"]
-                types = []
-                for c in flows.get("contracts", []):
-                    if c["name"] == module:
-                        meta = next((f for f in c.get("functions", []) if f["name"] == fn), None)
-                        if meta:
-                            types = [i.get("type","") for i in meta.get("inputs",[])]
-                            break
+                types = input_types.get((module, fn), [])
                 args = ", ".join(_default_rust_arg(t) for t in types)
                 calls.append(f"    let _ = {module}::{fn}({args});")
             body = "\n".join(calls) if calls else "    // no-op"
@@ -130,5 +132,5 @@ fn journey_compiles_and_runs() {{
 """)
 
         idx["tests"].append({ "id": f"{jid}_generated", "journey_id": jid, "tool": "cargo" })
-    (outdir / "tests_rust.json").write_text(json.dumps(idx, indent=2))
+    json_dump_atomic(outdir / "tests_rust.json", idx)
     return idx
@@ -1,28 +1,93 @@
 from __future__ import annotations
-import re, json, os, shutil
+import re, json, os, random, shutil, time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional
 import requests
-from jsonschema import validate, Draft202012Validator
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install contract-auditor[fast]
+    orjson = None
 
 ADDR_RE = re.compile(r"^0x[a-fA-F0-9]{40}$")
 
 def is_eth_address(s: str) -> bool:
     return bool(ADDR_RE.match(s))
 
-def atomic_write(path: Path, data: str) -> None:
+def atomic_write(path: Path, data: str | bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(data)
+    if isinstance(data, bytes):
+        tmp.write_bytes(data)
+    else:
+        tmp.write_text(data)
     tmp.replace(path)
 
-def json_dump_atomic(path: Path, obj: Any) -> None:
-    atomic_write(path, json.dumps(obj, indent=2))
+def json_dump_atomic(path: Path, obj: Any, indent: Optional[int] = 2) -> None:
+    # machine-read status files pass indent=None: compact output, same atomic swap
+    if orjson is not None and indent in (None, 2):
+        try:
+            # orjson emits UTF-8 bytes directly; OPT_INDENT_2 matches the stdlib's indent=2 layout
+            atomic_write(path, orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0))
+            return
+        except orjson.JSONEncodeError:
+            pass  # non-str keys or >64-bit ints: let the stdlib decide
+    atomic_write(path, json.dumps(obj, indent=indent))
 
-def validate_json(obj: Any, schema_path: Path) -> None:
-    schema = json.loads(schema_path.read_text())
+def json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity or >64-bit ints: let the stdlib decide
+    return json.loads(data)
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """Load JSON from path; a missing/unreadable file yields default (one open, no exists() probe)"""
+    try:
+        return json_loads(path.read_bytes())
+    except Exception:
+        return default
+
+@lru_cache(maxsize=32)
+def _schema_validator(schema_path: str, mtime_ns: int) -> Draft202012Validator:
+    # keyed by mtime so an edited schema is re-read and re-checked
+    schema = json_loads(Path(schema_path).read_bytes())
     Draft202012Validator.check_schema(schema)
-    validate(instance=obj, schema=schema)
+    return Draft202012Validator(schema)
+
+def validate_json(obj: Any, schema_path: Path) -> None:
+    validator = _schema_validator(str(schema_path), schema_path.stat().st_mtime_ns)
+    error = best_match(validator.iter_errors(obj))
+    if error is not None:
+        raise error
+
+def iter_source_files(root: Path, suffix: str) -> Iterator[Path]:
+    """Recursively yield files under root ending in suffix, like root.rglob("*" + suffix)"""
+    # os.walk is scandir-based: entry types come from the listing (no stat per path)
+    # and Path objects are only built for matches
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(suffix):
+                yield Path(dirpath, name)
+
+def link_or_copy(src: str | Path, dst: str | Path) -> None:
+    """Hardlink src to dst, falling back to a copy across filesystems or where links
+    are unsupported. Per-journey projects only read their sources, so sharing
+    inodes with work/src is safe and avoids rewriting every file for each journey."""
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        # replace rather than write through: dst may already be a link to src
+        os.unlink(dst)
+        link_or_copy(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 def copy_source_to_work(src: str, work_src: Path) -> None:
     work_src.mkdir(parents=True, exist_ok=True)
@@ -34,15 +99,77 @@ def copy_source_to_work(src: str, work_src: Path) -> None:
     else:
         raise FileNotFoundError(f"Input path not found: {src}")
 
+@lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    # one pooled session per process: repeated fetches (e.g. library callers auditing
+    # several addresses) reuse the keep-alive TLS connection to the API host
+    return requests.Session()
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either delta-seconds or an HTTP-date
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def _retry_delay(attempt: int, retry_after: Optional[str], base: float = 1.0, cap: float = 30.0) -> float:
+    # the server's Retry-After is honored in full (the caller's deadline decides whether
+    # to wait that long); otherwise exponential backoff with full jitter, capped
+    delay = _parse_retry_after(retry_after)
+    if delay is not None:
+        return delay
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def _backoff(attempt: int, retry_after: Optional[str], give_up_at: float) -> bool:
+    # sleep before the next attempt, unless that would overrun the overall deadline
+    delay = _retry_delay(attempt, retry_after)
+    if time.monotonic() + delay > give_up_at:
+        return False
+    time.sleep(delay)
+    return True
+
+def _etherscan_get(url: str, params: Dict[str, Any], attempts: int = 4, deadline: float = 120.0) -> Dict[str, Any]:
+    """GET an Etherscan endpoint, retrying transient failures (429/5xx, connection
+    errors and Etherscan's own rate-limit reply). Auth and client errors are not retried,
+    and no retry starts once `deadline` seconds (end to end) would be exceeded."""
+    give_up_at = time.monotonic() + deadline
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            # fail fast on connect; allow a slower body for large multi-file sources
+            r = _http_session().get(url, params=params, timeout=(5, 30))
+        except (requests.ConnectionError, requests.Timeout):
+            if last or not _backoff(attempt, None, give_up_at):
+                raise
+            continue
+        if r.status_code in RETRY_STATUSES and not last and _backoff(attempt, r.headers.get("Retry-After"), give_up_at):
+            continue
+        r.raise_for_status()
+        data = r.json()
+        # Etherscan reports throttling as HTTP 200 with status "0" and a rate-limit result
+        if data.get("status") == "0" and "rate limit" in str(data.get("result", "")).lower() and not last \
+                and _backoff(attempt, None, give_up_at):
+            continue
+        return data
+    raise AssertionError("unreachable")  # the last attempt always returns or raises
+
 def etherscan_fetch_sources(address: str, api_key: Optional[str], dest_dir: Path) -> Dict[str, Any]:
     """Fetch verified source from Etherscan and write files under dest_dir/sources/*"""
     if not api_key:
         raise ValueError("ETHERSCAN_API_KEY is required to fetch sources by address.")
     url = f"https://api.etherscan.io/api"
     params = {"module":"contract","action":"getsourcecode","address":address,"apikey":api_key}
-    r = requests.get(url, params=params, timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    data = _etherscan_get(url, params)
     if data.get("status") != "1" or not data.get("result"):
         raise RuntimeError(f"Etherscan error: {data.get('message')}")
     item = data["result"][0]
@@ -58,7 +185,7 @@ def etherscan_fetch_sources(address: str, api_key: Optional[str], dest_dir: Path
     # Etherscan sometimes wraps JSON in extra quotes/braces; try a few heuristics
     for candidate in (s, s.strip("{}"), s.strip('"')):
         try:
-            parsed = json.loads(candidate)
+            parsed = json_loads(candidate)
             break
         except Exception:
             parsed = None
@@ -85,5 +212,5 @@ def etherscan_fetch_sources(address: str, api_key: Optional[str], dest_dir: Path
         "compilerVersion": item.get("CompilerVersion"),
         "files": written
     }
-    (dest_dir / "meta.etherscan.json").write_text(json.dumps(meta, indent=2))
+    json_dump_atomic(dest_dir / "meta.etherscan.json", meta)
     return meta